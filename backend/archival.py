@@ -0,0 +1,124 @@
+"""Archival tier for finished orders.
+
+Orders created more than ORDER_ARCHIVE_AFTER_DAYS ago (default 180) and now
+in a terminal status (delivered or cancelled) are moved from `orders` to
+`orders_archive` in batches, so the hot collection and its indexes only hold
+recent and open orders. Each batch is copied before it is deleted, and an
+order is only deleted if its status is still the one that was copied, so an
+interrupted run leaves at worst a duplicate that the next run overwrites.
+
+The API runs the job every ORDER_ARCHIVE_INTERVAL_SECONDS (default 86400,
+0 disables). To run it by hand:
+
+    python archival.py --days 180
+"""
+import argparse
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ["delivered", "cancelled"]
+DEFAULT_ARCHIVE_AFTER_DAYS = 180
+DEFAULT_BATCH_SIZE = 500
+
+
+async def ensure_order_indexes(db):
+    for collection in (db.orders, db.orders_archive):
+        await collection.create_index([("user_id", 1), ("created_at", -1)])
+        await collection.create_index([("status", 1), ("created_at", -1)])
+        await collection.create_index([("created_at", -1)])
+    await db.orders.create_index("id")
+    await db.orders_archive.create_index("id", unique=True)
+
+
+async def archive_orders(db, older_than_days: int = DEFAULT_ARCHIVE_AFTER_DAYS,
+                         batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Move terminal orders older than the cutoff into orders_archive; returns how many moved"""
+    from pymongo import ReplaceOne
+
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=older_than_days)).isoformat()
+    query = {"status": {"$in": TERMINAL_STATUSES}, "created_at": {"$lt": cutoff}}
+    moved = 0
+
+    while True:
+        batch = await db.orders.find(query).sort("created_at", 1).limit(batch_size).to_list(batch_size)
+        if not batch:
+            break
+
+        await db.orders_archive.bulk_write(
+            [
+                ReplaceOne({"id": doc["id"]}, {k: v for k, v in doc.items() if k != "_id"}, upsert=True)
+                for doc in batch
+            ],
+            ordered=False
+        )
+        # Match the exact state that was copied: an order whose status changed
+        # in between (even to another terminal status) must not lose its hot copy
+        result = await db.orders.delete_many({
+            "$or": [{"_id": doc["_id"], "status": doc["status"]} for doc in batch],
+            "created_at": {"$lt": cutoff}
+        })
+        moved += result.deleted_count
+
+        if result.deleted_count < len(batch):
+            # Some orders changed status mid-batch; they stay hot, so drop their stale archive copy
+            still_hot = await db.orders.find(
+                {"_id": {"$in": [doc["_id"] for doc in batch]}}, {"id": 1}
+            ).to_list(len(batch))
+            await db.orders_archive.delete_many({"id": {"$in": [doc["id"] for doc in still_hot]}})
+        if len(batch) < batch_size:
+            break
+
+    if moved:
+        logger.info("Archived %d orders older than %s", moved, cutoff)
+    return moved
+
+
+async def find_orders(db, query: dict, limit: int, include_archived: bool = False) -> List[dict]:
+    """Newest-first orders matching query, optionally merged with the archive"""
+    orders = await db.orders.find(query, {"_id": 0}).sort("created_at", -1).to_list(limit)
+    if not include_archived:
+        return orders
+
+    archived = await db.orders_archive.find(query, {"_id": 0}).sort("created_at", -1).to_list(limit)
+    hot_ids = {o["id"] for o in orders}
+    merged = orders + [dict(o, archived=True) for o in archived if o["id"] not in hot_ids]
+    merged.sort(key=lambda o: str(o.get("created_at", "")), reverse=True)
+    return merged[:limit]
+
+
+async def _archive_from_cli(days: int, batch_size: int):
+    from database import mongo
+
+    db = mongo.open()
+    try:
+        await ensure_order_indexes(db)
+        moved = await archive_orders(db, days, batch_size)
+    finally:
+        mongo.close()
+    print(f"Archived {moved} orders")
+
+
+def main():
+    from dotenv import load_dotenv
+
+    load_dotenv(Path(__file__).parent / '.env')
+    parser = argparse.ArgumentParser(description="Move old finished orders to orders_archive")
+    parser.add_argument("--days", type=int,
+                        default=int(os.environ.get("ORDER_ARCHIVE_AFTER_DAYS", DEFAULT_ARCHIVE_AFTER_DAYS)),
+                        help="archive terminal orders older than this many days")
+    parser.add_argument("--batch-size", type=int,
+                        default=int(os.environ.get("ORDER_ARCHIVE_BATCH_SIZE", DEFAULT_BATCH_SIZE)))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_archive_from_cli(args.days, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""Static JSON snapshots of the catalog for nginx/CDN serving.
+
+Each build renders the catalog into a fresh version directory and then swaps
+manifest.json to point at it, so readers never see a half-written snapshot.
+Workers sharing the root take a file lock for the swap, and a build never
+replaces a manifest that points at a version read later than its own:
+
+    <root>/manifest.json                          {"version", "path", "generated_at", ...}
+    <root>/versions/<version>/categories.json
+    <root>/versions/<version>/products.json
+    <root>/versions/<version>/featured.json
+    <root>/versions/<version>/categories/<slug>.json
+    <root>/versions/<version>/products/<id>.json
+
+The API writes a new snapshot after every catalog change when
+CATALOG_SNAPSHOT_DIR is set. To build one by hand:
+
+    python catalog_snapshot.py --dir /var/www/catalog
+"""
+import argparse
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import re
+import shutil
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+SAFE_NAME = re.compile(r"^[A-Za-z0-9_-]+$")
+DEFAULT_KEEP = 3
+
+
+def _write_json(path: Path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, default=str)
+
+
+@contextmanager
+def _manifest_lock(root: Path):
+    """Serialise manifest swaps across worker processes sharing the snapshot root"""
+    root.mkdir(parents=True, exist_ok=True)
+    with open(root / ".manifest.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _current_version(root: Path) -> Optional[str]:
+    try:
+        with open(root / "manifest.json", encoding="utf-8") as f:
+            return json.load(f).get("version")
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _stage_version(staging: Path, categories: list, products: list):
+    _write_json(staging / "categories.json", categories)
+    _write_json(staging / "products.json", products)
+    _write_json(staging / "featured.json", [p for p in products if p.get("featured")])
+
+    by_category = {c["slug"]: [] for c in categories}
+    for product in products:
+        by_category.setdefault(product.get("category_slug"), []).append(product)
+    for slug, items in by_category.items():
+        if not slug or not SAFE_NAME.match(slug):
+            logger.warning("Skipping category with unsafe slug %r in snapshot", slug)
+            continue
+        _write_json(staging / "categories" / f"{slug}.json", items)
+
+    for product in products:
+        if not SAFE_NAME.match(product.get("id", "")):
+            logger.warning("Skipping product with unsafe id %r in snapshot", product.get("id"))
+            continue
+        _write_json(staging / "products" / f"{product['id']}.json", product)
+
+
+def _write_snapshot(root: Path, version: str, categories: list, products: list, keep: int) -> Optional[dict]:
+    """Write and publish a version; returns None if a newer one was already published"""
+    versions_dir = root / "versions"
+    staging = versions_dir / f".{version}.tmp"
+    target = versions_dir / version
+
+    try:
+        _stage_version(staging, categories, products)
+        staging.rename(target)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    with _manifest_lock(root):
+        current = _current_version(root)
+        if current is not None and current >= version:
+            # Another worker read the catalog after us and published first
+            shutil.rmtree(target, ignore_errors=True)
+            return None
+
+        manifest = {
+            "version": version,
+            "path": f"versions/{version}",
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "categories": len(categories),
+            "products": len(products),
+        }
+        manifest_tmp = root / f".manifest.{version}.tmp"
+        _write_json(manifest_tmp, manifest)
+        os.replace(manifest_tmp, root / "manifest.json")
+
+        # Keep the newest `keep` versions; CDN edges may still be reading older ones
+        existing = sorted(p for p in versions_dir.iterdir() if p.is_dir() and not p.name.startswith("."))
+        for old in existing[:-keep]:
+            shutil.rmtree(old, ignore_errors=True)
+
+    return manifest
+
+
+async def build_snapshot(db, root, keep: int = DEFAULT_KEEP) -> Optional[dict]:
+    """Render the current catalog into a new version directory under root.
+
+    The version is stamped before the catalog is read, so versions order by
+    how fresh their data is and an older read never replaces a newer one.
+    """
+    version = f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%fZ')}-{os.getpid()}"
+    categories = await db.categories.find({}, {"_id": 0}).to_list(None)
+    products = await db.products.find({}, {"_id": 0}).to_list(None)
+    manifest = await asyncio.to_thread(_write_snapshot, Path(root), version, categories, products, max(keep, 1))
+    if manifest is None:
+        logger.info("Catalog snapshot %s superseded by a newer one, discarded", version)
+    else:
+        logger.info("Catalog snapshot %s written (%d products)", version, len(products))
+    return manifest
+
+
+class SnapshotPublisher:
+    """Rebuilds the snapshot in the background, coalescing bursts of writes.
+
+    At most one build runs at a time; requests that arrive during a build
+    collapse into a single follow-up build.
+    """
+
+    def __init__(self, root, keep: int = DEFAULT_KEEP):
+        self.root = Path(root)
+        self.keep = keep
+        self._dirty = False
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls) -> Optional["SnapshotPublisher"]:
+        root = os.environ.get("CATALOG_SNAPSHOT_DIR")
+        if not root:
+            return None
+        return cls(root, int(os.environ.get("CATALOG_SNAPSHOT_KEEP", DEFAULT_KEEP)))
+
+    def request_rebuild(self, db):
+        self._dirty = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(db))
+
+    async def _run(self, db):
+        while self._dirty:
+            self._dirty = False
+            try:
+                await build_snapshot(db, self.root, self.keep)
+            except Exception:
+                logger.exception("Catalog snapshot build failed")
+
+    async def wait(self):
+        if self._task is not None:
+            await self._task
+
+
+async def _build_from_cli(root, keep: int):
+    from database import mongo
+
+    db = mongo.open()
+    try:
+        manifest = await build_snapshot(db, root, keep)
+    finally:
+        mongo.close()
+    print(json.dumps(manifest, indent=2))
+
+
+def main():
+    from dotenv import load_dotenv
+
+    load_dotenv(Path(__file__).parent / '.env')
+    parser = argparse.ArgumentParser(description="Build a static catalog snapshot")
+    parser.add_argument("--dir", default=os.environ.get("CATALOG_SNAPSHOT_DIR"),
+                        help="snapshot root (defaults to CATALOG_SNAPSHOT_DIR)")
+    parser.add_argument("--keep", type=int, default=int(os.environ.get("CATALOG_SNAPSHOT_KEEP", DEFAULT_KEEP)),
+                        help="number of versions to keep")
+    args = parser.parse_args()
+    if not args.dir:
+        parser.error("--dir or CATALOG_SNAPSHOT_DIR is required")
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_build_from_cli(args.dir, args.keep))
+
+
+if __name__ == "__main__":
+    main()
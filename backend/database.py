@@ -0,0 +1,112 @@
+"""MongoDB connection management for the Joyería Rocha API.
+
+The client is opened inside the app lifespan rather than at import time, so
+importing server.py never touches the network. Pool size, timeouts and read
+preference come from the environment:
+
+    MONGO_URL, DB_NAME                  required
+    MONGO_MAX_POOL_SIZE                 default 50
+    MONGO_MIN_POOL_SIZE                 default 5 (also the number of warm-up pings)
+    MONGO_MAX_IDLE_TIME_MS              default 60000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS   default 5000
+    MONGO_CONNECT_TIMEOUT_MS            default 5000
+    MONGO_SOCKET_TIMEOUT_MS             default 15000
+    MONGO_WAIT_QUEUE_TIMEOUT_MS         default 5000
+    MONGO_READ_PREFERENCE               default primary
+"""
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+@dataclass(frozen=True)
+class MongoSettings:
+    url: str
+    db_name: str
+    max_pool_size: int = 50
+    min_pool_size: int = 5
+    max_idle_time_ms: int = 60000
+    server_selection_timeout_ms: int = 5000
+    connect_timeout_ms: int = 5000
+    socket_timeout_ms: int = 15000
+    wait_queue_timeout_ms: int = 5000
+    read_preference: str = "primary"
+
+    @classmethod
+    def from_env(cls) -> "MongoSettings":
+        return cls(
+            url=os.environ['MONGO_URL'],
+            db_name=os.environ['DB_NAME'],
+            max_pool_size=_env_int('MONGO_MAX_POOL_SIZE', cls.max_pool_size),
+            min_pool_size=_env_int('MONGO_MIN_POOL_SIZE', cls.min_pool_size),
+            max_idle_time_ms=_env_int('MONGO_MAX_IDLE_TIME_MS', cls.max_idle_time_ms),
+            server_selection_timeout_ms=_env_int('MONGO_SERVER_SELECTION_TIMEOUT_MS', cls.server_selection_timeout_ms),
+            connect_timeout_ms=_env_int('MONGO_CONNECT_TIMEOUT_MS', cls.connect_timeout_ms),
+            socket_timeout_ms=_env_int('MONGO_SOCKET_TIMEOUT_MS', cls.socket_timeout_ms),
+            wait_queue_timeout_ms=_env_int('MONGO_WAIT_QUEUE_TIMEOUT_MS', cls.wait_queue_timeout_ms),
+            read_preference=os.environ.get('MONGO_READ_PREFERENCE', cls.read_preference),
+        )
+
+    def client_options(self) -> dict:
+        return {
+            "maxPoolSize": self.max_pool_size,
+            "minPoolSize": self.min_pool_size,
+            "maxIdleTimeMS": self.max_idle_time_ms,
+            "serverSelectionTimeoutMS": self.server_selection_timeout_ms,
+            "connectTimeoutMS": self.connect_timeout_ms,
+            "socketTimeoutMS": self.socket_timeout_ms,
+            "waitQueueTimeoutMS": self.wait_queue_timeout_ms,
+            "readPreference": self.read_preference,
+        }
+
+
+class MongoConnection:
+    """Owns the Motor client between app startup and shutdown"""
+
+    def __init__(self):
+        self.settings: Optional[MongoSettings] = None
+        self.client = None
+        self.db = None
+
+    def open(self, settings: Optional[MongoSettings] = None):
+        """Create the client and return the database handle (no network I/O yet)"""
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        self.settings = settings or MongoSettings.from_env()
+        self.client = AsyncIOMotorClient(self.settings.url, **self.settings.client_options())
+        self.db = self.client[self.settings.db_name]
+        return self.db
+
+    async def ping(self) -> float:
+        """Round-trip a ping to the server and return the latency in milliseconds"""
+        started = time.perf_counter()
+        await self.db.command("ping")
+        return (time.perf_counter() - started) * 1000
+
+    async def warm_up(self) -> bool:
+        """Open min_pool_size connections up front so the first requests don't pay for them"""
+        try:
+            await asyncio.gather(*(self.ping() for _ in range(max(self.settings.min_pool_size, 1))))
+        except Exception as exc:
+            logger.error("MongoDB warm-up failed: %s", exc)
+            return False
+        return True
+
+    def close(self):
+        if self.client is not None:
+            self.client.close()
+        self.client = None
+        self.db = None
+
+
+mongo = MongoConnection()
@@ -0,0 +1,116 @@
+"""In-process request throttling for the Joyería Rocha API.
+
+Two FastAPI dependencies are exposed:
+
+    rate_limit(name, per_minute, burst)   token bucket per client IP and per
+                                          session, 429 + Retry-After when empty
+    concurrency_limit(name, limit)        cap on in-flight requests for a route,
+                                          503 + Retry-After instead of queueing
+
+State lives in bounded LRU maps inside the worker process, so each uvicorn
+worker enforces its own budget.
+
+Clients are told apart by the address the last RATE_LIMIT_TRUSTED_PROXIES
+proxies appended to X-Forwarded-For. It defaults to 1 because the API is
+served through the hosting ingress; set it to 0 when the app is exposed
+directly, otherwise clients could pick their own address.
+"""
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi import HTTPException, Request
+
+MAX_TRACKED_KEYS = 10000
+
+
+class TokenBucketLimiter:
+    """Token buckets keyed by client, evicting the least recently seen key when full"""
+
+    def __init__(self, per_minute: float, burst: int, max_keys: int = MAX_TRACKED_KEYS):
+        self.rate = per_minute / 60.0
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def acquire(self, key: str, now: Optional[float] = None) -> float:
+        """Take one token for key. Returns 0 if allowed, else seconds until the next token."""
+        now = time.monotonic() if now is None else now
+        tokens, updated = self._buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+
+        if tokens >= 1:
+            wait = 0.0
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+def client_ip(request: Request) -> str:
+    trusted_proxies = int(os.environ.get("RATE_LIMIT_TRUSTED_PROXIES", "1"))
+    if trusted_proxies > 0:
+        forwarded = [part.strip() for part in request.headers.get("X-Forwarded-For", "").split(",") if part.strip()]
+        if len(forwarded) >= trusted_proxies:
+            return forwarded[-trusted_proxies]
+    return request.client.host if request.client else "unknown"
+
+
+def session_key(request: Request) -> Optional[str]:
+    token = request.cookies.get("session_token")
+    if not token:
+        auth_header = request.headers.get("Authorization")
+        if auth_header and auth_header.startswith("Bearer "):
+            token = auth_header[7:]
+    return token
+
+
+def rate_limit(name: str, per_minute: float, burst: int):
+    """Dependency that charges one token per request to the caller's IP and session"""
+    limiter = TokenBucketLimiter(per_minute, burst)
+
+    async def dependency(request: Request):
+        # Session buckets are only touched once the IP is within budget, so a
+        # flood of made-up session cookies can't churn other clients out of the LRU
+        wait = limiter.acquire(f"ip:{client_ip(request)}")
+        session = session_key(request)
+        if wait == 0 and session:
+            wait = limiter.acquire(f"session:{session}")
+        if wait > 0:
+            raise HTTPException(
+                status_code=429,
+                detail="Demasiadas solicitudes, intenta de nuevo en un momento",
+                headers={"Retry-After": str(math.ceil(wait))}
+            )
+
+    dependency.__name__ = f"rate_limit_{name}"
+    dependency.limiter = limiter
+    return dependency
+
+
+def concurrency_limit(name: str, limit: int, retry_after: int = 1):
+    """Dependency that rejects requests beyond `limit` in flight instead of queueing them"""
+    in_flight = 0
+
+    async def dependency():
+        nonlocal in_flight
+        if in_flight >= limit:
+            raise HTTPException(
+                status_code=503,
+                detail="Servicio ocupado, intenta de nuevo en un momento",
+                headers={"Retry-After": str(retry_after)}
+            )
+        in_flight += 1
+        try:
+            yield
+        finally:
+            in_flight -= 1
+
+    dependency.__name__ = f"concurrency_limit_{name}"
+    return dependency
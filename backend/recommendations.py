@@ -0,0 +1,136 @@
+"""Precomputed "customers also bought" neighbours for every product.
+
+The batch job counts how often two products appear in the same order
+(archived orders included, cancelled ones excluded), keeps the top-K
+co-purchased products per product, and tops the list up with products from
+the same category for items with little or no order history. Results go to
+the `product_related` collection, one document per product, so the API
+serves them with a single indexed lookup:
+
+    {"product_id": ..., "related": [product ids, best first], "updated_at": ...}
+
+The API refreshes it every RELATED_REFRESH_SECONDS (default 3600, 0 disables).
+To run it by hand:
+
+    python recommendations.py --top-k 8
+"""
+import argparse
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP_K = 8
+WRITE_BATCH_SIZE = 500
+
+
+def _co_purchase_neighbours(baskets, n_products: int, top_k: int) -> dict:
+    """Map product index -> up to top_k co-purchased product indexes, strongest first"""
+    import numpy as np
+
+    pair_keys = []
+    for basket in baskets:
+        if len(basket) < 2:
+            continue
+        members = np.fromiter(sorted(basket), dtype=np.int64, count=len(basket))
+        left, right = np.triu_indices(len(members), k=1)
+        pair_keys.append(members[left] * n_products + members[right])
+    if not pair_keys:
+        return {}
+
+    # Sparse co-occurrence counts: one entry per distinct pair, mirrored both ways
+    keys, counts = np.unique(np.concatenate(pair_keys), return_counts=True)
+    a, b = keys // n_products, keys % n_products
+    source = np.concatenate([a, b])
+    target = np.concatenate([b, a])
+    weight = np.concatenate([counts, counts])
+
+    ordering = np.lexsort((target, -weight, source))
+    source, target = source[ordering], target[ordering]
+    starts = np.flatnonzero(np.r_[True, source[1:] != source[:-1]])
+    ends = np.r_[starts[1:], len(source)]
+    return {
+        int(source[start]): target[start:min(end, start + top_k)].tolist()
+        for start, end in zip(starts, ends)
+    }
+
+
+async def build_related(db, top_k: int = DEFAULT_TOP_K) -> int:
+    """Recompute product_related from order history; returns the number of products written"""
+    from pymongo import ReplaceOne
+
+    products = await db.products.find(
+        {}, {"_id": 0, "id": 1, "category_slug": 1, "featured": 1, "created_at": 1}
+    ).to_list(None)
+    ids = [p["id"] for p in products]
+    index = {product_id: i for i, product_id in enumerate(ids)}
+
+    baskets = []
+    for collection in (db.orders, db.orders_archive):
+        async for order in collection.find({"status": {"$ne": "cancelled"}}, {"_id": 0, "items.product_id": 1}):
+            basket = {index[item["product_id"]] for item in order.get("items", []) if item.get("product_id") in index}
+            if len(basket) > 1:
+                baskets.append(basket)
+
+    neighbours = await asyncio.to_thread(_co_purchase_neighbours, baskets, len(ids), top_k)
+
+    # Cold-start fallback: same category, featured first, then newest
+    ranked = sorted(range(len(products)), key=lambda i: str(products[i].get("created_at", "")), reverse=True)
+    ranked.sort(key=lambda i: not products[i].get("featured"))
+    by_category = {}
+    for i in ranked:
+        by_category.setdefault(products[i].get("category_slug"), []).append(i)
+
+    now = datetime.now(timezone.utc).isoformat()
+    operations = []
+    for i, product in enumerate(products):
+        related = list(neighbours.get(i, []))
+        for candidate in by_category.get(product.get("category_slug"), []):
+            if len(related) >= top_k:
+                break
+            if candidate != i and candidate not in related:
+                related.append(candidate)
+        operations.append(ReplaceOne(
+            {"product_id": product["id"]},
+            {"product_id": product["id"], "related": [ids[j] for j in related], "updated_at": now},
+            upsert=True
+        ))
+
+    await db.product_related.create_index("product_id", unique=True)
+    for start in range(0, len(operations), WRITE_BATCH_SIZE):
+        await db.product_related.bulk_write(operations[start:start + WRITE_BATCH_SIZE], ordered=False)
+    await db.product_related.delete_many({"product_id": {"$nin": ids}})
+
+    logger.info("Related products rebuilt for %d products from %d multi-item orders", len(ids), len(baskets))
+    return len(ids)
+
+
+async def _build_from_cli(top_k: int):
+    from database import mongo
+
+    db = mongo.open()
+    try:
+        count = await build_related(db, top_k)
+    finally:
+        mongo.close()
+    print(f"Related products written for {count} products")
+
+
+def main():
+    from dotenv import load_dotenv
+
+    load_dotenv(Path(__file__).parent / '.env')
+    parser = argparse.ArgumentParser(description="Rebuild 'customers also bought' recommendations")
+    parser.add_argument("--top-k", type=int, default=int(os.environ.get("RELATED_TOP_K", DEFAULT_TOP_K)),
+                        help="neighbours to keep per product")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_build_from_cli(args.top_k))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Periodic background jobs that run inside the API process.
+
+Every uvicorn worker runs its own copy of each job, so jobs must be
+idempotent. A job whose interval is 0 or less is disabled.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, List
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJobs:
+    def __init__(self):
+        self._tasks: List[asyncio.Task] = []
+
+    def add(self, name: str, interval_seconds: float, job: Callable[[], Awaitable]):
+        if interval_seconds <= 0:
+            logger.info("Periodic job %s disabled", name)
+            return
+        self._tasks.append(asyncio.create_task(self._loop(name, interval_seconds, job)))
+
+    async def _loop(self, name: str, interval_seconds: float, job: Callable[[], Awaitable]):
+        while True:
+            try:
+                await job()
+            except Exception:
+                logger.exception("Periodic job %s failed", name)
+            await asyncio.sleep(interval_seconds)
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
@@ -1,7 +1,15 @@
 from fastapi import FastAPI, APIRouter, HTTPException, Query, Request, Response, Depends
 from dotenv import load_dotenv
+from fastapi.responses import JSONResponse
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from contextlib import asynccontextmanager
+from database import mongo
+from catalog_snapshot import SnapshotPublisher
+from rate_limit import rate_limit, concurrency_limit
+from recommendations import build_related, DEFAULT_TOP_K
+from scheduler import PeriodicJobs
+from archival import archive_orders, ensure_order_indexes, find_orders, DEFAULT_ARCHIVE_AFTER_DAYS
+import asyncio
 import os
 import logging
 from pathlib import Path
@@ -9,23 +17,79 @@ from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional
 import uuid
 from datetime import datetime, timezone, timedelta
-import httpx
-import bcrypt
+
+# Keep `import server` cheap: no network I/O here, and heavy or rarely used
+# modules (httpx, numpy, pandas, boto3, ...) are imported inside the functions
+# that need them. tests/test_startup.py enforces the import-time budget.
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+# MongoDB database handle, bound when the app starts
+db = None
+
+# Static catalog snapshots, enabled by CATALOG_SNAPSHOT_DIR
+catalog_snapshots = SnapshotPublisher.from_env()
+
+# Background batch jobs; each one logs and retries its own failures
+background_jobs = PeriodicJobs()
+
+# Neighbours kept per product by the recommendations job
+RELATED_TOP_K = int(os.environ.get('RELATED_TOP_K', DEFAULT_TOP_K))
+
+# How long the readiness probe waits for a Mongo ping before reporting 503
+READY_PING_TIMEOUT_SECONDS = 2
+
+def publish_catalog():
+    """Schedule a snapshot rebuild after a catalog or stock change"""
+    if catalog_snapshots:
+        catalog_snapshots.request_rebuild(db)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global db
+    db = mongo.open()
+    if not await mongo.warm_up():
+        logger.warning("MongoDB unreachable at startup; /api/health/ready will report 503")
+    # Runs until it succeeds, so a Mongo that comes up late still gets set up
+    setup_task = asyncio.create_task(prepare_database())
+
+    background_jobs.add(
+        "related-products",
+        float(os.environ.get('RELATED_REFRESH_SECONDS', 3600)),
+        lambda: build_related(db, RELATED_TOP_K)
+    )
+    archive_after_days = int(os.environ.get('ORDER_ARCHIVE_AFTER_DAYS', DEFAULT_ARCHIVE_AFTER_DAYS))
+    background_jobs.add(
+        "order-archival",
+        float(os.environ.get('ORDER_ARCHIVE_INTERVAL_SECONDS', 86400)),
+        lambda: archive_orders(db, archive_after_days)
+    )
+    yield
+    setup_task.cancel()
+    await asyncio.gather(setup_task, return_exceptions=True)
+    await background_jobs.stop()
+    if catalog_snapshots:
+        await catalog_snapshots.wait()
+    mongo.close()
 
 # Create the main app without a prefix
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
+# Per-route request budgets (per client IP and per session, per worker)
+SEED_RATE_LIMIT = Depends(rate_limit("seed", per_minute=2, burst=2))
+ADMIN_LOGIN_RATE_LIMIT = Depends(rate_limit("admin_login", per_minute=5, burst=5))
+SESSION_RATE_LIMIT = Depends(rate_limit("session", per_minute=10, burst=5))
+ORDER_RATE_LIMIT = Depends(rate_limit("orders", per_minute=10, burst=5))
+LISTING_RATE_LIMIT = Depends(rate_limit("listings", per_minute=120, burst=60))
+
+# Caps on in-flight full-collection listings, so a burst can't pile up Mongo scans
+PRODUCTS_CONCURRENCY = Depends(concurrency_limit("products", limit=32))
+ORDERS_CONCURRENCY = Depends(concurrency_limit("orders", limit=8))
+
 # ============== MODELS ==============
 
 class Category(BaseModel):
@@ -52,6 +116,7 @@ class Product(BaseModel):
     images: List[str]
     featured: bool = False
     in_stock: bool = True
+    stock: int = 1
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class ProductCreate(BaseModel):
@@ -62,6 +127,7 @@ class ProductCreate(BaseModel):
     images: List[str]
     featured: bool = False
     in_stock: bool = True
+    stock: int = Field(default=1, ge=0)
 
 class ProductUpdate(BaseModel):
     name: Optional[str] = None
@@ -71,12 +137,15 @@ class ProductUpdate(BaseModel):
     images: Optional[List[str]] = None
     featured: Optional[bool] = None
     in_stock: Optional[bool] = None
+    stock: Optional[int] = Field(default=None, ge=0)
+    # Stock the admin saw when editing; required with stock so a concurrent sale isn't undone
+    expected_stock: Optional[int] = None
 
 class CartItem(BaseModel):
     product_id: str
     name: str
     price: float
-    quantity: int
+    quantity: int = Field(gt=0)
     image: str
 
 class OrderCreate(BaseModel):
@@ -100,6 +169,7 @@ class Order(BaseModel):
     total: float
     notes: str = ""
     status: str = "pending"
+    archived: bool = False
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class BankInfo(BaseModel):
@@ -210,9 +280,84 @@ async def require_admin(request: Request) -> User:
         raise HTTPException(status_code=403, detail="Admin access required")
     return user
 
+# ============== INVENTORY HELPERS ==============
+
+def group_quantities(items: List[dict]) -> dict:
+    """Sum quantities per product_id so repeated lines reserve together"""
+    quantities = {}
+    for item in items:
+        quantities[item["product_id"]] = quantities.get(item["product_id"], 0) + item["quantity"]
+    return quantities
+
+async def release_stock(quantities: dict):
+    """Put reserved units back on the shelf"""
+    await asyncio.gather(*(
+        db.products.update_one({"id": product_id}, {"$inc": {"stock": qty}})
+        for product_id, qty in quantities.items()
+    ))
+
+async def reserve_stock(items: List[dict]):
+    """Reserve every order line or none of them.
+
+    Each product is decremented with a conditional update (stock >= qty), so
+    concurrent buyers can never take the same unit twice. Lines that were
+    reserved before another one failed are released again. in_stock is the
+    admin's "on sale" flag and is never changed here; a product is available
+    when it is on sale and has stock left.
+    """
+    quantities = group_quantities(items)
+    results = await asyncio.gather(*(
+        db.products.update_one(
+            {"id": product_id, "in_stock": True, "stock": {"$gte": qty}},
+            {"$inc": {"stock": -qty}}
+        )
+        for product_id, qty in quantities.items()
+    ), return_exceptions=True)
+
+    reserved = {
+        product_id: qty
+        for (product_id, qty), result in zip(quantities.items(), results)
+        if not isinstance(result, BaseException) and result.modified_count == 1
+    }
+    if len(reserved) == len(quantities):
+        return
+
+    await release_stock(reserved)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+    names = {item["product_id"]: item["name"] for item in items}
+    unavailable = [names[product_id] for product_id in quantities if product_id not in reserved]
+    raise HTTPException(status_code=409, detail=f"Sin existencias suficientes: {', '.join(unavailable)}")
+
+async def prepare_inventory():
+    # Products created before stock tracking get one unit if they were on sale
+    await db.products.update_many(
+        {"stock": {"$exists": False}},
+        [{"$set": {"stock": {"$cond": ["$in_stock", 1, 0]}}}]
+    )
+    await db.products.create_index("id", unique=True)
+    # Serves the related-products fallback for items the batch job hasn't seen yet
+    await db.products.create_index([("category_slug", 1), ("featured", -1), ("created_at", -1)])
+
+async def prepare_database(max_delay: float = 60):
+    """Idempotent startup setup (stock backfill, indexes), retried until MongoDB answers"""
+    delay = 1
+    while True:
+        try:
+            await prepare_inventory()
+            await ensure_order_indexes(db)
+            break
+        except Exception as exc:
+            logger.warning("Database setup failed, retrying in %ss: %s", delay, exc)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_delay)
+    publish_catalog()
+
 # ============== AUTH ROUTES ==============
 
-@api_router.post("/auth/session")
+@api_router.post("/auth/session", dependencies=[SESSION_RATE_LIMIT])
 async def process_session(request: Request, response: Response):
     """Process session_id from Emergent Auth and create local session"""
     body = await request.json()
@@ -221,6 +366,8 @@ async def process_session(request: Request, response: Response):
     if not session_id:
         raise HTTPException(status_code=400, detail="session_id required")
     
+    import httpx
+
     # REMINDER: DO NOT HARDCODE THE URL, OR ADD ANY FALLBACKS OR REDIRECT URLS, THIS BREAKS THE AUTH
     async with httpx.AsyncClient() as client:
         auth_response = await client.get(
@@ -292,7 +439,7 @@ async def process_session(request: Request, response: Response):
         "role": role
     }
 
-@api_router.post("/auth/admin-login")
+@api_router.post("/auth/admin-login", dependencies=[ADMIN_LOGIN_RATE_LIMIT])
 async def admin_login(credentials: AdminLogin, response: Response):
     """Admin login with email and password"""
     email = credentials.email.lower()
@@ -383,6 +530,20 @@ async def logout(request: Request, response: Response):
 async def root():
     return {"message": "Joyería Rocha API"}
 
+# ---- Health ----
+@api_router.get("/health/ready")
+async def health_ready():
+    """Readiness probe: pings MongoDB and reports the round-trip latency"""
+    try:
+        latency_ms = await asyncio.wait_for(mongo.ping(), timeout=READY_PING_TIMEOUT_SECONDS)
+    except Exception as exc:
+        logger.warning("Readiness check failed: %s", exc)
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unavailable", "mongo": {"error": type(exc).__name__}}
+        )
+    return {"status": "ready", "mongo": {"latency_ms": round(latency_ms, 2)}}
+
 # ---- Categories ----
 @api_router.get("/categories", response_model=List[Category])
 async def get_categories():
@@ -395,6 +556,7 @@ async def create_category(input: CategoryCreate, request: Request):
     category = Category(**input.model_dump())
     doc = category.model_dump()
     await db.categories.insert_one(doc)
+    publish_catalog()
     return category
 
 @api_router.delete("/categories/{category_id}")
@@ -403,10 +565,11 @@ async def delete_category(category_id: str, request: Request):
     result = await db.categories.delete_one({"id": category_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Category not found")
+    publish_catalog()
     return {"message": "Category deleted"}
 
 # ---- Products ----
-@api_router.get("/products", response_model=List[Product])
+@api_router.get("/products", response_model=List[Product], dependencies=[LISTING_RATE_LIMIT, PRODUCTS_CONCURRENCY])
 async def get_products(
     category: Optional[str] = Query(None),
     featured: Optional[bool] = Query(None)
@@ -432,6 +595,34 @@ async def get_product(product_id: str):
         product['created_at'] = datetime.fromisoformat(product['created_at'])
     return product
 
+@api_router.get("/products/{product_id}/related", response_model=List[Product])
+async def get_related_products(product_id: str, limit: int = Query(4, ge=1, le=RELATED_TOP_K)):
+    """Customers also bought: neighbours precomputed by recommendations.build_related"""
+    available = {"in_stock": True, "stock": {"$gt": 0}}
+    related = await db.product_related.find_one({"product_id": product_id}, {"_id": 0, "related": 1})
+    if related is None:
+        # Added since the last refresh: same category, featured first, then newest
+        product = await db.products.find_one({"id": product_id}, {"_id": 0, "category_slug": 1})
+        if not product:
+            return []
+        products = await db.products.find(
+            {"category_slug": product.get("category_slug"), "id": {"$ne": product_id}, **available},
+            {"_id": 0}
+        ).sort([("featured", -1), ("created_at", -1)]).to_list(limit)
+    elif not related["related"]:
+        return []
+    else:
+        products = await db.products.find(
+            {"id": {"$in": related["related"]}, **available},
+            {"_id": 0}
+        ).to_list(len(related["related"]))
+        rank = {pid: i for i, pid in enumerate(related["related"])}
+        products.sort(key=lambda p: rank[p["id"]])
+    for p in products:
+        if isinstance(p.get('created_at'), str):
+            p['created_at'] = datetime.fromisoformat(p['created_at'])
+    return products[:limit]
+
 @api_router.post("/products", response_model=Product)
 async def create_product(input: ProductCreate, request: Request):
     await require_admin(request)
@@ -439,6 +630,7 @@ async def create_product(input: ProductCreate, request: Request):
     doc = product.model_dump()
     doc['created_at'] = doc['created_at'].isoformat()
     await db.products.insert_one(doc)
+    publish_catalog()
     return product
 
 @api_router.put("/products/{product_id}", response_model=Product)
@@ -448,10 +640,21 @@ async def update_product(product_id: str, input: ProductUpdate, request: Request
     if not existing:
         raise HTTPException(status_code=404, detail="Product not found")
     
-    update_data = {k: v for k, v in input.model_dump().items() if v is not None}
+    update_data = {k: v for k, v in input.model_dump(exclude={"expected_stock"}).items() if v is not None}
+    query = {"id": product_id}
+    if "stock" in update_data:
+        if input.expected_stock is None:
+            raise HTTPException(status_code=400, detail="expected_stock is required when setting stock")
+        query["stock"] = input.expected_stock
     if update_data:
-        await db.products.update_one({"id": product_id}, {"$set": update_data})
-    
+        result = await db.products.update_one(query, {"$set": update_data})
+        if result.matched_count == 0:
+            raise HTTPException(
+                status_code=409,
+                detail="Las existencias cambiaron mientras editabas; recarga e intenta de nuevo"
+            )
+    
+    publish_catalog()
     updated = await db.products.find_one({"id": product_id}, {"_id": 0})
     if isinstance(updated.get('created_at'), str):
         updated['created_at'] = datetime.fromisoformat(updated['created_at'])
@@ -463,10 +666,11 @@ async def delete_product(product_id: str, request: Request):
     result = await db.products.delete_one({"id": product_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Product not found")
+    publish_catalog()
     return {"message": "Product deleted"}
 
 # ---- Orders ----
-@api_router.post("/orders", response_model=Order)
+@api_router.post("/orders", response_model=Order, dependencies=[ORDER_RATE_LIMIT])
 async def create_order(input: OrderCreate, request: Request):
     # Get user if authenticated
     user = await get_current_user(request)
@@ -478,13 +682,21 @@ async def create_order(input: OrderCreate, request: Request):
     doc = order.model_dump()
     doc['created_at'] = doc['created_at'].isoformat()
     doc['items'] = [item.model_dump() if hasattr(item, 'model_dump') else item for item in doc['items']]
-    await db.orders.insert_one(doc)
+
+    await reserve_stock(doc['items'])
+    try:
+        await db.orders.insert_one(doc)
+    except Exception:
+        await release_stock(group_quantities(doc['items']))
+        raise
+    publish_catalog()
     return order
 
-@api_router.get("/orders", response_model=List[Order])
+@api_router.get("/orders", response_model=List[Order], dependencies=[LISTING_RATE_LIMIT, ORDERS_CONCURRENCY])
 async def get_orders(
     request: Request,
-    status: Optional[str] = Query(None)
+    status: Optional[str] = Query(None),
+    include_archived: bool = Query(False)
 ):
     """Get orders - admin sees all, users see their own"""
     user = await get_current_user(request)
@@ -504,21 +716,39 @@ async def get_orders(
         # Not authenticated - return empty
         return []
     
-    orders = await db.orders.find(query, {"_id": 0}).sort("created_at", -1).to_list(1000)
+    orders = await find_orders(db, query, 1000, include_archived)
     for o in orders:
         if isinstance(o.get('created_at'), str):
             o['created_at'] = datetime.fromisoformat(o['created_at'])
     return orders
 
-@api_router.get("/orders/my-history")
-async def get_my_orders(request: Request):
-    """Get current user's order history"""
+async def attach_current_products(orders: List[dict]):
+    """Attach the live product to every order line, batched into one $in query"""
+    product_ids = {item["product_id"] for order in orders for item in order.get("items", [])}
+    if not product_ids:
+        return
+    
+    products = await db.products.find(
+        {"id": {"$in": list(product_ids)}},
+        {"_id": 0, "id": 1, "name": 1, "price": 1, "images": 1, "category_slug": 1, "in_stock": 1, "stock": 1}
+    ).to_list(len(product_ids))
+    by_id = {p["id"]: p for p in products}
+    for order in orders:
+        for item in order.get("items", []):
+            item["product"] = by_id.get(item["product_id"])
+
+@api_router.get("/orders/my-history", dependencies=[LISTING_RATE_LIMIT, ORDERS_CONCURRENCY])
+async def get_my_orders(
+    request: Request,
+    include_archived: bool = Query(False),
+    expand: Optional[str] = Query(None)
+):
+    """Get current user's order history; expand=products attaches current product info"""
     user = await require_auth(request)
     
-    orders = await db.orders.find(
-        {"user_id": user.user_id}, 
-        {"_id": 0}
-    ).sort("created_at", -1).to_list(100)
+    orders = await find_orders(db, {"user_id": user.user_id}, 100, include_archived)
+    if expand and "products" in expand.split(","):
+        await attach_current_products(orders)
     
     for o in orders:
         if isinstance(o.get('created_at'), str):
@@ -530,9 +760,36 @@ async def get_my_orders(request: Request):
 async def update_order_status(order_id: str, status: str = Query(...), request: Request = None):
     if request:
         await require_admin(request)
-    result = await db.orders.update_one({"id": order_id}, {"$set": {"status": status}})
-    if result.matched_count == 0:
+
+    # Reopening a cancelled order has to win its stock back first
+    if status != "cancelled":
+        cancelled = await db.orders.find_one({"id": order_id, "status": "cancelled"}, {"_id": 0, "items": 1})
+        if cancelled:
+            await reserve_stock(cancelled["items"])
+            result = await db.orders.update_one(
+                {"id": order_id, "status": "cancelled"},
+                {"$set": {"status": status}}
+            )
+            if result.modified_count == 0:
+                await release_stock(group_quantities(cancelled["items"]))
+            publish_catalog()
+            return {"message": "Order status updated"}
+
+    from pymongo import ReturnDocument
+
+    previous = await db.orders.find_one_and_update(
+        {"id": order_id},
+        {"$set": {"status": status}},
+        projection={"_id": 0, "status": 1, "items": 1},
+        return_document=ReturnDocument.BEFORE
+    )
+    if previous is None:
+        if await db.orders_archive.count_documents({"id": order_id}, limit=1):
+            raise HTTPException(status_code=409, detail="Archived orders can't be changed")
         raise HTTPException(status_code=404, detail="Order not found")
+    if status == "cancelled" and previous.get("status") != "cancelled":
+        await release_stock(group_quantities(previous["items"]))
+        publish_catalog()
     return {"message": "Order status updated"}
 
 # ---- Store Settings ----
@@ -552,7 +809,7 @@ async def update_settings(input: StoreSettings, request: Request):
     return input
 
 # ---- Seed Data ----
-@api_router.post("/seed")
+@api_router.post("/seed", dependencies=[SEED_RATE_LIMIT])
 async def seed_data():
     # Check if already seeded
     existing = await db.categories.count_documents({})
@@ -571,25 +828,26 @@ async def seed_data():
     
     # Products
     products = [
-        {"id": str(uuid.uuid4()), "name": "Anillo Solitario Diamante", "description": "Elegante anillo solitario con diamante de 0.5 quilates en oro blanco de 18k", "price": 2500.00, "category_slug": "anillos", "images": ["https://images.unsplash.com/photo-1605100804763-247f67b3557e?w=800"], "featured": True, "in_stock": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "name": "Anillo Oro Rosa", "description": "Delicado anillo de oro rosa con pequeños diamantes", "price": 1200.00, "category_slug": "anillos", "images": ["https://images.unsplash.com/photo-1602751584552-8ba73aad10e1?w=800"], "featured": False, "in_stock": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "name": "Anillo Eternidad", "description": "Anillo de eternidad con diamantes alrededor en oro amarillo", "price": 3200.00, "category_slug": "anillos", "images": ["https://images.unsplash.com/photo-1599643478518-a784e5dc4c8f?w=800"], "featured": True, "in_stock": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "name": "Collar Perlas Naturales", "description": "Elegante collar de perlas cultivadas del mar del sur", "price": 1800.00, "category_slug": "collares", "images": ["https://images.unsplash.com/photo-1515562141207-7a88fb7ce338?w=800"], "featured": True, "in_stock": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "name": "Collar Cadena Oro", "description": "Cadena fina de oro amarillo 18k estilo veneciano", "price": 850.00, "category_slug": "collares", "images": ["https://images.unsplash.com/photo-1599643477877-530eb83abc8e?w=800"], "featured": False, "in_stock": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "name": "Collar Diamante Solitario", "description": "Collar con colgante de diamante solitario en oro blanco", "price": 2200.00, "category_slug": "collares", "images": ["https://images.unsplash.com/photo-1611085583191-a3b181a88401?w=800"], "featured": True, "in_stock": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "name": "Pulsera Tennis Diamantes", "description": "Pulsera tennis con 3 quilates de diamantes en oro blanco", "price": 4500.00, "category_slug": "pulseras", "images": ["https://images.unsplash.com/photo-1611591437281-460bfbe1220a?w=800"], "featured": True, "in_stock": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "name": "Pulsera Eslabones Oro", "description": "Pulsera de eslabones gruesos en oro amarillo 18k", "price": 1600.00, "category_slug": "pulseras", "images": ["https://images.unsplash.com/photo-1573408301185-9146fe634ad0?w=800"], "featured": False, "in_stock": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "name": "Aretes Diamante Gota", "description": "Aretes colgantes con diamantes en forma de gota", "price": 2800.00, "category_slug": "aretes", "images": ["https://images.unsplash.com/photo-1535632066927-ab7c9ab60908?w=800"], "featured": True, "in_stock": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "name": "Aretes Perla Stud", "description": "Aretes clásicos de perla con base de oro", "price": 650.00, "category_slug": "aretes", "images": ["https://images.unsplash.com/photo-1617038260897-41a1f14a8ca0?w=800"], "featured": False, "in_stock": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "name": "Aretes Argolla Oro", "description": "Aretes de argolla medianos en oro amarillo pulido", "price": 480.00, "category_slug": "aretes", "images": ["https://images.unsplash.com/photo-1630019852942-f89202989a59?w=800"], "featured": False, "in_stock": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "name": "Reloj Clásico Oro", "description": "Reloj elegante con caja de oro y correa de cuero negro", "price": 3800.00, "category_slug": "relojes", "images": ["https://images.unsplash.com/photo-1524592094714-0f0654e20314?w=800"], "featured": True, "in_stock": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "name": "Reloj Diamantes Dama", "description": "Reloj para dama con bisel de diamantes", "price": 5200.00, "category_slug": "relojes", "images": ["https://images.unsplash.com/photo-1548169874-53e85f753f1e?w=800"], "featured": True, "in_stock": True, "created_at": datetime.now(timezone.utc).isoformat()},
+        {"id": str(uuid.uuid4()), "name": "Anillo Solitario Diamante", "description": "Elegante anillo solitario con diamante de 0.5 quilates en oro blanco de 18k", "price": 2500.00, "category_slug": "anillos", "images": ["https://images.unsplash.com/photo-1605100804763-247f67b3557e?w=800"], "featured": True, "in_stock": True, "stock": 1, "created_at": datetime.now(timezone.utc).isoformat()},
+        {"id": str(uuid.uuid4()), "name": "Anillo Oro Rosa", "description": "Delicado anillo de oro rosa con pequeños diamantes", "price": 1200.00, "category_slug": "anillos", "images": ["https://images.unsplash.com/photo-1602751584552-8ba73aad10e1?w=800"], "featured": False, "in_stock": True, "stock": 1, "created_at": datetime.now(timezone.utc).isoformat()},
+        {"id": str(uuid.uuid4()), "name": "Anillo Eternidad", "description": "Anillo de eternidad con diamantes alrededor en oro amarillo", "price": 3200.00, "category_slug": "anillos", "images": ["https://images.unsplash.com/photo-1599643478518-a784e5dc4c8f?w=800"], "featured": True, "in_stock": True, "stock": 1, "created_at": datetime.now(timezone.utc).isoformat()},
+        {"id": str(uuid.uuid4()), "name": "Collar Perlas Naturales", "description": "Elegante collar de perlas cultivadas del mar del sur", "price": 1800.00, "category_slug": "collares", "images": ["https://images.unsplash.com/photo-1515562141207-7a88fb7ce338?w=800"], "featured": True, "in_stock": True, "stock": 1, "created_at": datetime.now(timezone.utc).isoformat()},
+        {"id": str(uuid.uuid4()), "name": "Collar Cadena Oro", "description": "Cadena fina de oro amarillo 18k estilo veneciano", "price": 850.00, "category_slug": "collares", "images": ["https://images.unsplash.com/photo-1599643477877-530eb83abc8e?w=800"], "featured": False, "in_stock": True, "stock": 1, "created_at": datetime.now(timezone.utc).isoformat()},
+        {"id": str(uuid.uuid4()), "name": "Collar Diamante Solitario", "description": "Collar con colgante de diamante solitario en oro blanco", "price": 2200.00, "category_slug": "collares", "images": ["https://images.unsplash.com/photo-1611085583191-a3b181a88401?w=800"], "featured": True, "in_stock": True, "stock": 1, "created_at": datetime.now(timezone.utc).isoformat()},
+        {"id": str(uuid.uuid4()), "name": "Pulsera Tennis Diamantes", "description": "Pulsera tennis con 3 quilates de diamantes en oro blanco", "price": 4500.00, "category_slug": "pulseras", "images": ["https://images.unsplash.com/photo-1611591437281-460bfbe1220a?w=800"], "featured": True, "in_stock": True, "stock": 1, "created_at": datetime.now(timezone.utc).isoformat()},
+        {"id": str(uuid.uuid4()), "name": "Pulsera Eslabones Oro", "description": "Pulsera de eslabones gruesos en oro amarillo 18k", "price": 1600.00, "category_slug": "pulseras", "images": ["https://images.unsplash.com/photo-1573408301185-9146fe634ad0?w=800"], "featured": False, "in_stock": True, "stock": 1, "created_at": datetime.now(timezone.utc).isoformat()},
+        {"id": str(uuid.uuid4()), "name": "Aretes Diamante Gota", "description": "Aretes colgantes con diamantes en forma de gota", "price": 2800.00, "category_slug": "aretes", "images": ["https://images.unsplash.com/photo-1535632066927-ab7c9ab60908?w=800"], "featured": True, "in_stock": True, "stock": 1, "created_at": datetime.now(timezone.utc).isoformat()},
+        {"id": str(uuid.uuid4()), "name": "Aretes Perla Stud", "description": "Aretes clásicos de perla con base de oro", "price": 650.00, "category_slug": "aretes", "images": ["https://images.unsplash.com/photo-1617038260897-41a1f14a8ca0?w=800"], "featured": False, "in_stock": True, "stock": 1, "created_at": datetime.now(timezone.utc).isoformat()},
+        {"id": str(uuid.uuid4()), "name": "Aretes Argolla Oro", "description": "Aretes de argolla medianos en oro amarillo pulido", "price": 480.00, "category_slug": "aretes", "images": ["https://images.unsplash.com/photo-1630019852942-f89202989a59?w=800"], "featured": False, "in_stock": True, "stock": 1, "created_at": datetime.now(timezone.utc).isoformat()},
+        {"id": str(uuid.uuid4()), "name": "Reloj Clásico Oro", "description": "Reloj elegante con caja de oro y correa de cuero negro", "price": 3800.00, "category_slug": "relojes", "images": ["https://images.unsplash.com/photo-1524592094714-0f0654e20314?w=800"], "featured": True, "in_stock": True, "stock": 1, "created_at": datetime.now(timezone.utc).isoformat()},
+        {"id": str(uuid.uuid4()), "name": "Reloj Diamantes Dama", "description": "Reloj para dama con bisel de diamantes", "price": 5200.00, "category_slug": "relojes", "images": ["https://images.unsplash.com/photo-1548169874-53e85f753f1e?w=800"], "featured": True, "in_stock": True, "stock": 1, "created_at": datetime.now(timezone.utc).isoformat()},
     ]
     await db.products.insert_many(products)
     
     # Default settings
     settings = StoreSettings()
     await db.settings.insert_one(settings.model_dump())
+    publish_catalog()
     
     return {"message": "Data seeded successfully", "categories": len(categories), "products": len(products)}
 
@@ -610,7 +868,3 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
-
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
@@ -1,5 +1,6 @@
 import { Link } from 'react-router-dom';
 import { motion } from 'framer-motion';
+import { isAvailable } from '../lib/utils';
 
 export const ProductCard = ({ product, index = 0 }) => {
   const formatPrice = (price) => {
@@ -33,7 +34,7 @@ export const ProductCard = ({ product, index = 0 }) => {
               Destacado
             </span>
           )}
-          {!product.in_stock && (
+          {!isAvailable(product) && (
             <div className="absolute inset-0 bg-black/60 flex items-center justify-center">
               <span className="text-white/80 uppercase tracking-widest text-sm">Agotado</span>
             </div>
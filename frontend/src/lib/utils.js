@@ -4,3 +4,8 @@ import { twMerge } from "tailwind-merge"
 export function cn(...inputs) {
   return twMerge(clsx(inputs));
 }
+
+// A product can be bought when the admin has it on sale and units are left
+export function isAvailable(product) {
+  return product.in_stock && (product.stock ?? 1) > 0;
+}
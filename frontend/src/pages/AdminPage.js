@@ -24,7 +24,8 @@ export const AdminPage = () => {
     category_slug: '',
     images: '',
     featured: false,
-    in_stock: true
+    in_stock: true,
+    stock: '1'
   });
 
   useEffect(() => {
@@ -37,7 +38,7 @@ export const AdminPage = () => {
       const [prodRes, catRes, orderRes, settingsRes] = await Promise.all([
         axios.get(`${API}/products`),
         axios.get(`${API}/categories`),
-        axios.get(`${API}/orders`),
+        axios.get(`${API}/orders`, { params: { include_archived: true } }),
         axios.get(`${API}/settings`)
       ]);
       setProducts(prodRes.data);
@@ -81,7 +82,8 @@ export const AdminPage = () => {
         category_slug: product.category_slug,
         images: product.images.join('\n'),
         featured: product.featured,
-        in_stock: product.in_stock
+        in_stock: product.in_stock,
+        stock: (product.stock ?? 0).toString()
       });
     } else {
       setEditingProduct(null);
@@ -92,7 +94,8 @@ export const AdminPage = () => {
         category_slug: categories[0]?.slug || '',
         images: '',
         featured: false,
-        in_stock: true
+        in_stock: true,
+        stock: '1'
       });
     }
     setShowProductModal(true);
@@ -111,6 +114,16 @@ export const AdminPage = () => {
       in_stock: productForm.in_stock
     };
 
+    // Only send stock when the admin changed it, checked against the value
+    // they loaded so units sold in the meantime are not put back
+    const stock = parseInt(productForm.stock, 10) || 0;
+    if (!editingProduct) {
+      productData.stock = stock;
+    } else if (stock !== (editingProduct.stock ?? 0)) {
+      productData.stock = stock;
+      productData.expected_stock = editingProduct.stock ?? 0;
+    }
+
     try {
       if (editingProduct) {
         await axios.put(`${API}/products/${editingProduct.id}`, productData);
@@ -123,7 +136,12 @@ export const AdminPage = () => {
       fetchData();
     } catch (error) {
       console.error('Error saving product:', error);
-      toast.error('Error al guardar el producto');
+      if (error.response?.status === 409) {
+        toast.error(error.response.data.detail);
+        fetchData();
+      } else {
+        toast.error('Error al guardar el producto');
+      }
     }
   };
 
@@ -246,6 +264,9 @@ export const AdminPage = () => {
                           <span className="text-xs bg-[#D4AF37]/20 text-[#D4AF37] px-2 py-1">Destacado</span>
                         )}
                         {!product.in_stock && (
+                          <span className="text-xs bg-white/10 text-white/60 px-2 py-1">Oculto</span>
+                        )}
+                        {product.in_stock && (product.stock ?? 0) <= 0 && (
                           <span className="text-xs bg-red-500/20 text-red-400 px-2 py-1">Agotado</span>
                         )}
                       </div>
@@ -300,6 +321,7 @@ export const AdminPage = () => {
                           <select
                             value={order.status}
                             onChange={(e) => updateOrderStatus(order.id, e.target.value)}
+                            disabled={order.archived}
                             className="bg-[#0A0A0A] border border-white/10 text-white text-sm px-3 py-2"
                             data-testid={`order-status-${order.id}`}
                           >
@@ -508,6 +530,20 @@ export const AdminPage = () => {
                 </div>
               </div>
 
+              <div className="form-group">
+                <label className="form-label">Existencias *</label>
+                <input
+                  type="number"
+                  value={productForm.stock}
+                  onChange={(e) => setProductForm({...productForm, stock: e.target.value})}
+                  className="input-elegant"
+                  min="0"
+                  step="1"
+                  required
+                  data-testid="product-form-stock"
+                />
+              </div>
+
               <div className="form-group">
                 <label className="form-label flex items-center gap-2">
                   <Image size={14} strokeWidth={1.5} />
@@ -543,7 +579,7 @@ export const AdminPage = () => {
                     className="w-4 h-4 accent-[#D4AF37]"
                     data-testid="product-form-in-stock"
                   />
-                  <span className="text-white/70 text-sm">En Stock</span>
+                  <span className="text-white/70 text-sm">A la venta</span>
                 </label>
               </div>
 
@@ -106,7 +106,11 @@ export const CheckoutPage = () => {
       navigate('/');
     } catch (error) {
       console.error('Error creating order:', error);
-      toast.error('Error al procesar el pedido');
+      if (error.response?.status === 409) {
+        toast.error(error.response.data.detail);
+      } else {
+        toast.error('Error al procesar el pedido');
+      }
     } finally {
       setIsSubmitting(false);
     }
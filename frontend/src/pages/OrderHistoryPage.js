@@ -21,6 +21,7 @@ export const OrderHistoryPage = () => {
       
       try {
         const res = await axios.get(`${API}/orders/my-history`, {
+          params: { include_archived: true, expand: 'products' },
           withCredentials: true
         });
         setOrders(res.data);
@@ -153,17 +154,35 @@ export const OrderHistoryPage = () => {
                   </div>
 
                   <div className="flex flex-wrap gap-4 mb-4">
-                    {order.items.map((item, idx) => (
-                      <div key={idx} className="flex items-center gap-3">
-                        <div className="w-12 h-14 bg-[#050505] overflow-hidden">
-                          <img src={item.image} alt={item.name} className="w-full h-full object-cover" />
+                    {order.items.map((item, idx) => {
+                      const name = item.product?.name || item.name;
+                      const image = item.product?.images?.[0] || item.image;
+                      const content = (
+                        <>
+                          <div className="w-12 h-14 bg-[#050505] overflow-hidden">
+                            <img src={image} alt={name} className="w-full h-full object-cover" />
+                          </div>
+                          <div>
+                            <p className="text-white text-sm">{name}</p>
+                            <p className="text-white/50 text-xs">x{item.quantity}</p>
+                          </div>
+                        </>
+                      );
+                      return item.product ? (
+                        <Link
+                          key={idx}
+                          to={`/producto/${item.product.id}`}
+                          className="flex items-center gap-3 hover:opacity-80 transition-opacity"
+                          data-testid={`order-item-link-${item.product.id}`}
+                        >
+                          {content}
+                        </Link>
+                      ) : (
+                        <div key={idx} className="flex items-center gap-3">
+                          {content}
                         </div>
-                        <div>
-                          <p className="text-white text-sm">{item.name}</p>
-                          <p className="text-white/50 text-xs">x{item.quantity}</p>
-                        </div>
-                      </div>
-                    ))}
+                      );
+                    })}
                   </div>
 
                   <div className="flex justify-between items-center pt-4 border-t border-white/10">
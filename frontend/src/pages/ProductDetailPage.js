@@ -4,6 +4,8 @@ import { motion } from 'framer-motion';
 import { ChevronRight, Minus, Plus, ShoppingBag, MessageCircle } from 'lucide-react';
 import axios from 'axios';
 import { useCart } from '../context/CartContext';
+import { ProductCard } from '../components/ProductCard';
+import { isAvailable } from '../lib/utils';
 import { toast } from 'sonner';
 
 const API = `${process.env.REACT_APP_BACKEND_URL}/api`;
@@ -11,6 +13,7 @@ const API = `${process.env.REACT_APP_BACKEND_URL}/api`;
 export const ProductDetailPage = () => {
   const { id } = useParams();
   const [product, setProduct] = useState(null);
+  const [relatedProducts, setRelatedProducts] = useState([]);
   const [loading, setLoading] = useState(true);
   const [selectedImage, setSelectedImage] = useState(0);
   const [quantity, setQuantity] = useState(1);
@@ -27,7 +30,16 @@ export const ProductDetailPage = () => {
         setLoading(false);
       }
     };
+    const fetchRelated = async () => {
+      try {
+        const res = await axios.get(`${API}/products/${id}/related`);
+        setRelatedProducts(res.data);
+      } catch (error) {
+        setRelatedProducts([]);
+      }
+    };
     fetchProduct();
+    fetchRelated();
   }, [id]);
 
   const formatPrice = (price) => {
@@ -40,7 +52,7 @@ export const ProductDetailPage = () => {
   };
 
   const handleAddToCart = () => {
-    if (!product.in_stock) return;
+    if (!isAvailable(product)) return;
     addItem(product, quantity);
     toast.success(`${product.name} agregado al carrito`);
   };
@@ -176,7 +188,7 @@ export const ProductDetailPage = () => {
                     {quantity}
                   </span>
                   <button
-                    onClick={() => setQuantity(quantity + 1)}
+                    onClick={() => setQuantity(Math.max(1, Math.min(product.stock ?? quantity + 1, quantity + 1)))}
                     className="qty-btn"
                     data-testid="qty-increase"
                   >
@@ -189,12 +201,12 @@ export const ProductDetailPage = () => {
               <div className="space-y-4">
                 <button
                   onClick={handleAddToCart}
-                  disabled={!product.in_stock}
-                  className={`btn-primary w-full flex items-center justify-center gap-3 ${!product.in_stock ? 'opacity-50 cursor-not-allowed' : ''}`}
+                  disabled={!isAvailable(product)}
+                  className={`btn-primary w-full flex items-center justify-center gap-3 ${!isAvailable(product) ? 'opacity-50 cursor-not-allowed' : ''}`}
                   data-testid="add-to-cart-btn"
                 >
                   <ShoppingBag size={18} strokeWidth={1.5} />
-                  {product.in_stock ? 'Agregar al Carrito' : 'Agotado'}
+                  {isAvailable(product) ? 'Agregar al Carrito' : 'Agotado'}
                 </button>
 
                 <button
@@ -219,6 +231,26 @@ export const ProductDetailPage = () => {
           </div>
         </div>
       </section>
+
+      {/* Customers also bought */}
+      {relatedProducts.length > 0 && (
+        <section className="py-16 md:py-24 border-t border-white/5" data-testid="related-products">
+          <div className="container-luxury">
+            <p className="caption text-[#D4AF37] mb-4">Recomendados</p>
+            <h2
+              className="text-3xl md:text-4xl text-white mb-12"
+              style={{ fontFamily: "'Playfair Display', serif" }}
+            >
+              Clientes también compraron
+            </h2>
+            <div className="grid grid-cols-2 lg:grid-cols-4 gap-6 md:gap-8">
+              {relatedProducts.map((related, index) => (
+                <ProductCard key={related.id} product={related} index={index} />
+              ))}
+            </div>
+          </div>
+        </section>
+      )}
     </div>
   );
 };
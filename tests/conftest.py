@@ -0,0 +1,42 @@
+import os
+import sys
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+from starlette.requests import Request
+
+BACKEND_DIR = Path(__file__).resolve().parents[1] / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("MONGO_URL", "mongodb://127.0.0.1:1")
+os.environ.setdefault("DB_NAME", "joyeria_test")
+
+ADMIN_TOKEN = "session_admin_test"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """In-memory Mongo bound to server.db for the duration of a test"""
+    import server
+
+    database = AsyncMongoMockClient()["joyeria_test"]
+    monkeypatch.setattr(server, "db", database)
+    return database
+
+
+def make_request(token: str = None) -> Request:
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers, "query_string": b""})
+
+
+async def add_admin(db):
+    await db.users.insert_one({
+        "user_id": "user_admin", "email": "admin@example.com", "name": "Admin",
+        "role": "admin", "created_at": datetime.now(timezone.utc).isoformat()
+    })
+    await db.user_sessions.insert_one({
+        "user_id": "user_admin", "session_token": ADMIN_TOKEN,
+        "expires_at": (datetime.now(timezone.utc) + timedelta(days=1)).isoformat()
+    })
+    return make_request(ADMIN_TOKEN)
@@ -0,0 +1,113 @@
+import asyncio
+from datetime import datetime, timezone, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+import server
+from archival import archive_orders, find_orders
+
+
+def days_ago(days):
+    return (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+
+
+def order(order_id, status, age_days, user_id="u1"):
+    return {"id": order_id, "user_id": user_id, "status": status, "created_at": days_ago(age_days), "items": []}
+
+
+def test_archive_moves_only_old_terminal_orders_in_batches(db):
+    orders = [
+        order("old-delivered-1", "delivered", 400),
+        order("old-delivered-2", "delivered", 300),
+        order("old-cancelled", "cancelled", 200),
+        order("old-pending", "pending", 400),
+        order("recent-delivered", "delivered", 10),
+    ]
+
+    async def scenario():
+        await db.orders.insert_many(orders)
+        # A copy left behind by an interrupted run is overwritten, not duplicated
+        await db.orders_archive.insert_one(order("old-cancelled", "cancelled", 200))
+        moved = await archive_orders(db, older_than_days=180, batch_size=2)
+        hot = sorted([o["id"] async for o in db.orders.find({})])
+        archived = sorted([o["id"] async for o in db.orders_archive.find({})])
+        return moved, hot, archived
+
+    moved, hot, archived = asyncio.run(scenario())
+
+    assert moved == 3
+    assert hot == ["old-pending", "recent-delivered"]
+    assert archived == ["old-cancelled", "old-delivered-1", "old-delivered-2"]
+
+
+def test_find_orders_merges_archive_newest_first_without_duplicates(db):
+    async def scenario():
+        await db.orders.insert_many([order("hot-1", "pending", 1), order("hot-2", "delivered", 5)])
+        await db.orders_archive.insert_many([
+            order("arch-1", "delivered", 3),
+            order("arch-2", "delivered", 400),
+            order("hot-2", "delivered", 5),
+            order("other-user", "delivered", 2, user_id="u2"),
+        ])
+        hot_only = await find_orders(db, {"user_id": "u1"}, limit=10)
+        merged = await find_orders(db, {"user_id": "u1"}, limit=10, include_archived=True)
+        limited = await find_orders(db, {"user_id": "u1"}, limit=2, include_archived=True)
+        return hot_only, merged, limited
+
+    hot_only, merged, limited = asyncio.run(scenario())
+
+    assert [o["id"] for o in hot_only] == ["hot-1", "hot-2"]
+    assert [o["id"] for o in merged] == ["hot-1", "arch-1", "hot-2", "arch-2"]
+    assert [o.get("archived", False) for o in merged] == [False, True, False, True]
+    assert [o["id"] for o in limited] == ["hot-1", "arch-1"]
+
+
+def test_archived_order_status_cannot_be_changed(db):
+    async def scenario():
+        await db.orders_archive.insert_one(order("arch-1", "delivered", 400))
+        with pytest.raises(HTTPException) as archived:
+            await server.update_order_status("arch-1", "pending")
+        with pytest.raises(HTTPException) as missing:
+            await server.update_order_status("nope", "pending")
+        return archived.value.status_code, missing.value.status_code
+
+    assert asyncio.run(scenario()) == (409, 404)
+
+
+def test_order_whose_status_changes_mid_batch_stays_hot(db):
+    class ReopenAfterCopy:
+        """Archive collection that lets the admin reopen an order right after the copy"""
+
+        def __init__(self, archive):
+            self._archive = archive
+
+        def __getattr__(self, name):
+            return getattr(self._archive, name)
+
+        async def bulk_write(self, requests, **kwargs):
+            result = await self._archive.bulk_write(requests, **kwargs)
+            await server.update_order_status("old-cancelled", "delivered")
+            return result
+
+    class RacingDb:
+        orders = db.orders
+        orders_archive = ReopenAfterCopy(db.orders_archive)
+
+    async def scenario():
+        await db.products.insert_one({"id": "p1", "in_stock": True, "stock": 1})
+        cancelled = order("old-cancelled", "cancelled", 400)
+        cancelled["items"] = [{"product_id": "p1", "quantity": 1}]
+        await db.orders.insert_many([cancelled, order("old-delivered", "delivered", 400)])
+        moved = await archive_orders(RacingDb(), older_than_days=180)
+        hot = {o["id"]: o["status"] async for o in db.orders.find({})}
+        archived = sorted([o["id"] async for o in db.orders_archive.find({})])
+        stock = (await db.products.find_one({"id": "p1"}))["stock"]
+        return moved, hot, archived, stock
+
+    moved, hot, archived, stock = asyncio.run(scenario())
+
+    assert moved == 1
+    assert hot == {"old-cancelled": "delivered"}
+    assert archived == ["old-delivered"]
+    assert stock == 0
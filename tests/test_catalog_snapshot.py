@@ -0,0 +1,68 @@
+import asyncio
+import json
+
+import pytest
+
+import catalog_snapshot
+from catalog_snapshot import build_snapshot, _write_snapshot
+
+CATEGORIES = [{"id": "c1", "name": "Anillos", "slug": "anillos"}]
+PRODUCTS = [
+    {"id": "p1", "name": "Anillo", "category_slug": "anillos", "featured": True},
+    {"id": "p2", "name": "Collar", "category_slug": "collares", "featured": False},
+]
+
+
+def read_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_snapshot_layout_and_manifest(db, tmp_path):
+    async def scenario():
+        await db.categories.insert_many([dict(c) for c in CATEGORIES])
+        await db.products.insert_many([dict(p) for p in PRODUCTS])
+        return await build_snapshot(db, tmp_path)
+
+    manifest = asyncio.run(scenario())
+
+    assert read_json(tmp_path / "manifest.json") == manifest
+    version_dir = tmp_path / manifest["path"]
+    assert read_json(version_dir / "categories.json") == CATEGORIES
+    assert [p["id"] for p in read_json(version_dir / "products.json")] == ["p1", "p2"]
+    assert [p["id"] for p in read_json(version_dir / "featured.json")] == ["p1"]
+    assert [p["id"] for p in read_json(version_dir / "categories" / "anillos.json")] == ["p1"]
+    assert [p["id"] for p in read_json(version_dir / "categories" / "collares.json")] == ["p2"]
+    assert read_json(version_dir / "products" / "p2.json")["name"] == "Collar"
+
+
+def test_older_build_does_not_replace_a_newer_manifest(tmp_path):
+    _write_snapshot(tmp_path, "20260102T000000000000Z-2", CATEGORIES, PRODUCTS, keep=3)
+    assert _write_snapshot(tmp_path, "20260101T000000000000Z-1", CATEGORIES, [], keep=3) is None
+
+    assert read_json(tmp_path / "manifest.json")["version"] == "20260102T000000000000Z-2"
+    assert [p.name for p in (tmp_path / "versions").iterdir()] == ["20260102T000000000000Z-2"]
+
+
+def test_old_versions_are_pruned(tmp_path):
+    for day in range(1, 5):
+        _write_snapshot(tmp_path, f"2026010{day}T000000000000Z-1", CATEGORIES, PRODUCTS, keep=2)
+
+    remaining = sorted(p.name for p in (tmp_path / "versions").iterdir())
+    assert remaining == ["20260103T000000000000Z-1", "20260104T000000000000Z-1"]
+
+
+def test_failed_build_removes_its_staging_directory(tmp_path, monkeypatch):
+    write_json = catalog_snapshot._write_json
+
+    def failing_write(path, data):
+        if path.parent.name == "products":
+            raise OSError("disk full")
+        write_json(path, data)
+
+    monkeypatch.setattr(catalog_snapshot, "_write_json", failing_write)
+    with pytest.raises(OSError):
+        _write_snapshot(tmp_path, "20260101T000000000000Z-1", CATEGORIES, PRODUCTS, keep=3)
+
+    assert list((tmp_path / "versions").iterdir()) == []
+    assert not (tmp_path / "manifest.json").exists()
@@ -0,0 +1,86 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+import server
+from database import MongoSettings
+
+
+def test_settings_map_env_onto_client_options(monkeypatch):
+    monkeypatch.setenv("MONGO_URL", "mongodb://db.internal:27017")
+    monkeypatch.setenv("DB_NAME", "joyeria")
+    monkeypatch.setenv("MONGO_MAX_POOL_SIZE", "80")
+    monkeypatch.setenv("MONGO_MIN_POOL_SIZE", "10")
+    monkeypatch.setenv("MONGO_MAX_IDLE_TIME_MS", "30000")
+    monkeypatch.setenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "2000")
+    monkeypatch.setenv("MONGO_CONNECT_TIMEOUT_MS", "1500")
+    monkeypatch.setenv("MONGO_SOCKET_TIMEOUT_MS", "9000")
+    monkeypatch.setenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "750")
+    monkeypatch.setenv("MONGO_READ_PREFERENCE", "secondaryPreferred")
+
+    settings = MongoSettings.from_env()
+
+    assert (settings.url, settings.db_name) == ("mongodb://db.internal:27017", "joyeria")
+    assert settings.client_options() == {
+        "maxPoolSize": 80,
+        "minPoolSize": 10,
+        "maxIdleTimeMS": 30000,
+        "serverSelectionTimeoutMS": 2000,
+        "connectTimeoutMS": 1500,
+        "socketTimeoutMS": 9000,
+        "waitQueueTimeoutMS": 750,
+        "readPreference": "secondaryPreferred",
+    }
+
+
+def test_settings_defaults_when_env_is_unset_or_empty(monkeypatch):
+    for name in ("MONGO_MAX_POOL_SIZE", "MONGO_MIN_POOL_SIZE", "MONGO_MAX_IDLE_TIME_MS",
+                 "MONGO_SERVER_SELECTION_TIMEOUT_MS", "MONGO_CONNECT_TIMEOUT_MS",
+                 "MONGO_WAIT_QUEUE_TIMEOUT_MS", "MONGO_READ_PREFERENCE"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("MONGO_SOCKET_TIMEOUT_MS", "")
+
+    options = MongoSettings.from_env().client_options()
+
+    assert options["maxPoolSize"] == 50
+    assert options["minPoolSize"] == 5
+    assert options["socketTimeoutMS"] == 15000
+    assert options["readPreference"] == "primary"
+
+
+def test_health_ready_reports_ping_latency(monkeypatch):
+    async def ping():
+        return 3.14159
+
+    monkeypatch.setattr(server.mongo, "ping", ping)
+
+    response = TestClient(server.app).get("/api/health/ready")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready", "mongo": {"latency_ms": 3.14}}
+
+
+def test_health_ready_is_503_when_ping_fails(monkeypatch):
+    async def ping():
+        raise ConnectionError("mongo down")
+
+    monkeypatch.setattr(server.mongo, "ping", ping)
+
+    response = TestClient(server.app).get("/api/health/ready")
+
+    assert response.status_code == 503
+    assert response.json() == {"status": "unavailable", "mongo": {"error": "ConnectionError"}}
+
+
+def test_health_ready_is_503_when_ping_times_out(monkeypatch):
+    async def ping():
+        await asyncio.sleep(1)
+        return 1.0
+
+    monkeypatch.setattr(server.mongo, "ping", ping)
+    monkeypatch.setattr(server, "READY_PING_TIMEOUT_SECONDS", 0.01)
+
+    response = TestClient(server.app).get("/api/health/ready")
+
+    assert response.status_code == 503
+    assert response.json()["mongo"]["error"] == "TimeoutError"
@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+import server
+from tests.conftest import add_admin, make_request
+
+
+def product(product_id, stock, in_stock=True):
+    return {
+        "id": product_id, "name": f"Joya {product_id}", "description": "", "price": 100.0,
+        "category_slug": "anillos", "images": [], "featured": False,
+        "in_stock": in_stock, "stock": stock, "created_at": "2026-01-01T00:00:00+00:00"
+    }
+
+
+def order_input(*lines):
+    return server.OrderCreate(
+        customer_name="Cliente", customer_phone="88888888", customer_address="Granada",
+        items=[
+            {"product_id": pid, "name": f"Joya {pid}", "price": 100.0, "quantity": qty, "image": ""}
+            for pid, qty in lines
+        ],
+        total=100.0 * sum(qty for _, qty in lines)
+    )
+
+
+async def stock_of(db, product_id):
+    return (await db.products.find_one({"id": product_id}))["stock"]
+
+
+def test_last_unit_is_sold_once_under_concurrent_orders(db):
+    async def scenario():
+        await db.products.insert_one(product("p1", stock=1))
+        results = await asyncio.gather(
+            server.create_order(order_input(("p1", 1)), make_request()),
+            server.create_order(order_input(("p1", 1)), make_request()),
+            return_exceptions=True
+        )
+        return results, await stock_of(db, "p1"), await db.orders.count_documents({})
+
+    results, stock, orders = asyncio.run(scenario())
+
+    placed = [r for r in results if isinstance(r, server.Order)]
+    rejected = [r for r in results if isinstance(r, HTTPException)]
+    assert len(placed) == 1 and len(rejected) == 1
+    assert rejected[0].status_code == 409
+    assert stock == 0
+    assert orders == 1
+
+
+def test_short_line_releases_the_lines_already_reserved(db):
+    async def scenario():
+        await db.products.insert_many([product("p1", stock=2), product("p2", stock=3), product("p3", stock=0)])
+        with pytest.raises(HTTPException) as excinfo:
+            await server.create_order(order_input(("p1", 1), ("p2", 2), ("p3", 1)), make_request())
+        return excinfo.value, [await stock_of(db, pid) for pid in ("p1", "p2", "p3")], await db.orders.count_documents({})
+
+    error, stocks, orders = asyncio.run(scenario())
+
+    assert error.status_code == 409
+    assert "Joya p3" in error.detail
+    assert stocks == [2, 3, 0]
+    assert orders == 0
+
+
+def test_repeated_lines_are_reserved_together(db):
+    async def scenario():
+        await db.products.insert_one(product("p1", stock=1))
+        with pytest.raises(HTTPException):
+            await server.create_order(order_input(("p1", 1), ("p1", 1)), make_request())
+        return await stock_of(db, "p1")
+
+    assert asyncio.run(scenario()) == 1
+
+
+def test_cancel_restores_stock_and_reopen_reserves_it_again(db):
+    async def scenario():
+        await db.products.insert_one(product("p1", stock=2))
+        order = await server.create_order(order_input(("p1", 2)), make_request())
+        after_order = await stock_of(db, "p1")
+        await server.update_order_status(order.id, "cancelled")
+        after_cancel = await stock_of(db, "p1")
+        await server.update_order_status(order.id, "cancelled")
+        after_second_cancel = await stock_of(db, "p1")
+        await server.update_order_status(order.id, "pending")
+        after_reopen = await stock_of(db, "p1")
+        return after_order, after_cancel, after_second_cancel, after_reopen
+
+    assert asyncio.run(scenario()) == (0, 2, 2, 0)
+
+
+def test_reopen_fails_when_the_stock_was_sold_meanwhile(db):
+    async def scenario():
+        await db.products.insert_one(product("p1", stock=1))
+        order = await server.create_order(order_input(("p1", 1)), make_request())
+        await server.update_order_status(order.id, "cancelled")
+        await server.create_order(order_input(("p1", 1)), make_request())
+        with pytest.raises(HTTPException) as excinfo:
+            await server.update_order_status(order.id, "pending")
+        status = (await db.orders.find_one({"id": order.id}))["status"]
+        return excinfo.value.status_code, status, await stock_of(db, "p1")
+
+    assert asyncio.run(scenario()) == (409, "cancelled", 0)
+
+
+def test_cancel_keeps_a_hidden_product_hidden(db):
+    async def scenario():
+        await db.products.insert_one(product("p1", stock=2))
+        order = await server.create_order(order_input(("p1", 1)), make_request())
+        await db.products.update_one({"id": "p1"}, {"$set": {"in_stock": False}})
+        await server.update_order_status(order.id, "cancelled")
+        return await db.products.find_one({"id": "p1"})
+
+    doc = asyncio.run(scenario())
+    assert doc["stock"] == 2
+    assert doc["in_stock"] is False
+
+
+def test_admin_stock_edit_is_rejected_after_a_concurrent_sale(db):
+    async def scenario():
+        admin = await add_admin(db)
+        await db.products.insert_one(product("p1", stock=1))
+        # The admin loaded stock=1, then a customer bought the unit
+        await server.create_order(order_input(("p1", 1)), make_request())
+        with pytest.raises(HTTPException) as excinfo:
+            await server.update_product("p1", server.ProductUpdate(stock=1, expected_stock=1), admin)
+        await server.update_product("p1", server.ProductUpdate(description="Nueva"), admin)
+        return excinfo.value.status_code, await db.products.find_one({"id": "p1"})
+
+    status_code, doc = asyncio.run(scenario())
+    assert status_code == 409
+    assert doc["stock"] == 0
+    assert doc["description"] == "Nueva"
+
+
+def test_admin_stock_edit_requires_the_expected_value(db):
+    async def scenario():
+        admin = await add_admin(db)
+        await db.products.insert_one(product("p1", stock=1))
+        with pytest.raises(HTTPException) as excinfo:
+            await server.update_product("p1", server.ProductUpdate(stock=5), admin)
+        updated = await server.update_product("p1", server.ProductUpdate(stock=5, expected_stock=1), admin)
+        return excinfo.value.status_code, updated["stock"]
+
+    assert asyncio.run(scenario()) == (400, 5)
@@ -0,0 +1,50 @@
+import asyncio
+
+import server
+from tests.conftest import add_admin
+
+
+def test_expand_products_uses_one_in_query_and_marks_deleted_products(db, monkeypatch):
+    collection_class = type(db.products)
+    find = collection_class.find
+    product_queries = []
+
+    def spy_find(self, *args, **kwargs):
+        if self.name == "products":
+            product_queries.append(args[0] if args else kwargs.get("filter"))
+        return find(self, *args, **kwargs)
+
+    monkeypatch.setattr(collection_class, "find", spy_find)
+
+    def line(product_id):
+        return {"product_id": product_id, "name": "Snapshot", "price": 1.0, "quantity": 1, "image": "old.jpg"}
+
+    async def scenario():
+        request = await add_admin(db)
+        await db.products.insert_many([
+            {"id": "p1", "name": "Anillo actual", "price": 10.0, "images": ["new.jpg"], "in_stock": True, "stock": 1},
+            {"id": "p2", "name": "Collar actual", "price": 20.0, "images": ["c.jpg"], "in_stock": True, "stock": 0},
+        ])
+        await db.orders.insert_many([
+            {"id": "o1", "user_id": "user_admin", "status": "delivered", "created_at": "2026-01-02T00:00:00+00:00",
+             "items": [line("p1"), line("gone")]},
+            {"id": "o2", "user_id": "user_admin", "status": "pending", "created_at": "2026-01-01T00:00:00+00:00",
+             "items": [line("p1"), line("p2")]},
+        ])
+        plain = await server.get_my_orders(request, include_archived=False, expand=None)
+        plain_queries = len(product_queries)
+        expanded = await server.get_my_orders(request, include_archived=False, expand="products")
+        return plain, plain_queries, expanded
+
+    plain, plain_queries, expanded = asyncio.run(scenario())
+
+    assert plain_queries == 0
+    assert "product" not in plain[0]["items"][0]
+    assert len(product_queries) == 1
+    assert sorted(product_queries[0]["id"]["$in"]) == ["gone", "p1", "p2"]
+
+    first, second = expanded
+    assert first["items"][0]["product"]["name"] == "Anillo actual"
+    assert first["items"][0]["name"] == "Snapshot"
+    assert first["items"][1]["product"] is None
+    assert [item["product"]["id"] for item in second["items"]] == ["p1", "p2"]
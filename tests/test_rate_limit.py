@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from rate_limit import TokenBucketLimiter, client_ip, concurrency_limit, rate_limit
+
+
+def make_request(forwarded_for=None, session=None, peer="10.0.0.1"):
+    headers = []
+    if forwarded_for:
+        headers.append((b"x-forwarded-for", forwarded_for.encode()))
+    if session:
+        headers.append((b"authorization", f"Bearer {session}".encode()))
+    return Request({"type": "http", "headers": headers, "client": (peer, 1234)})
+
+
+def test_bucket_allows_burst_then_refills_at_the_rate():
+    limiter = TokenBucketLimiter(per_minute=60, burst=2)
+
+    assert limiter.acquire("a", now=0) == 0
+    assert limiter.acquire("a", now=0) == 0
+    assert limiter.acquire("a", now=0) == pytest.approx(1.0)
+    assert limiter.acquire("a", now=1.0) == 0
+    assert limiter.acquire("b", now=1.0) == 0
+
+
+def test_bucket_map_is_bounded_and_evicts_least_recent():
+    limiter = TokenBucketLimiter(per_minute=60, burst=1, max_keys=2)
+    limiter.acquire("a", now=0)
+    limiter.acquire("b", now=0)
+    limiter.acquire("a", now=0)
+    limiter.acquire("c", now=0)
+
+    assert list(limiter._buckets) == ["a", "c"]
+
+
+def test_client_ip_uses_the_trusted_proxy_hop(monkeypatch):
+    request = make_request(forwarded_for="1.1.1.1, 2.2.2.2, 3.3.3.3")
+
+    monkeypatch.setenv("RATE_LIMIT_TRUSTED_PROXIES", "1")
+    assert client_ip(request) == "3.3.3.3"
+    monkeypatch.setenv("RATE_LIMIT_TRUSTED_PROXIES", "2")
+    assert client_ip(request) == "2.2.2.2"
+    monkeypatch.setenv("RATE_LIMIT_TRUSTED_PROXIES", "0")
+    assert client_ip(request) == "10.0.0.1"
+
+
+def test_denied_ip_does_not_touch_session_buckets(monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_TRUSTED_PROXIES", "0")
+    dependency = rate_limit("test", per_minute=1, burst=1)
+
+    async def scenario():
+        await dependency(make_request(session="s1"))
+        with pytest.raises(HTTPException) as excinfo:
+            await dependency(make_request(session="s2"))
+        return excinfo.value
+
+    error = asyncio.run(scenario())
+    assert error.status_code == 429
+    assert int(error.headers["Retry-After"]) > 0
+    assert set(dependency.limiter._buckets) == {"ip:10.0.0.1", "session:s1"}
+
+
+def test_concurrency_limit_rejects_instead_of_queueing():
+    dependency = concurrency_limit("test", limit=1, retry_after=2)
+
+    async def scenario():
+        first = dependency()
+        await first.__anext__()
+        with pytest.raises(HTTPException) as excinfo:
+            await dependency().__anext__()
+        await first.aclose()
+        third = dependency()
+        await third.__anext__()
+        await third.aclose()
+        return excinfo.value
+
+    error = asyncio.run(scenario())
+    assert error.status_code == 503
+    assert error.headers["Retry-After"] == "2"
@@ -0,0 +1,107 @@
+import asyncio
+
+import server
+from recommendations import _co_purchase_neighbours, build_related
+
+
+def test_neighbours_are_ranked_by_co_purchase_count():
+    baskets = [{0, 1}, {0, 1}, {0, 2}, {0, 1, 3}, {2, 3}]
+
+    neighbours = _co_purchase_neighbours(baskets, n_products=5, top_k=3)
+
+    assert neighbours[0] == [1, 2, 3]
+    assert neighbours[1] == [0, 3]
+    assert neighbours[3] == [0, 1, 2]
+    assert 4 not in neighbours
+
+
+def test_ties_break_by_product_index_and_respect_top_k():
+    baskets = [{0, 3}, {0, 1}, {0, 2}]
+
+    neighbours = _co_purchase_neighbours(baskets, n_products=4, top_k=2)
+
+    assert neighbours[0] == [1, 2]
+
+
+def test_no_multi_item_orders_means_no_neighbours():
+    assert _co_purchase_neighbours([{0}], n_products=2, top_k=3) == {}
+
+
+def test_build_related_falls_back_to_same_category(db):
+    products = [
+        {"id": "a1", "category_slug": "anillos", "featured": False, "created_at": "2026-01-01T00:00:00+00:00"},
+        {"id": "a2", "category_slug": "anillos", "featured": True, "created_at": "2026-01-02T00:00:00+00:00"},
+        {"id": "a3", "category_slug": "anillos", "featured": False, "created_at": "2026-01-03T00:00:00+00:00"},
+        {"id": "c1", "category_slug": "collares", "featured": False, "created_at": "2026-01-01T00:00:00+00:00"},
+    ]
+    orders = [
+        {"id": "o1", "status": "delivered", "items": [{"product_id": "a1"}, {"product_id": "c1"}]},
+        {"id": "o2", "status": "cancelled", "items": [{"product_id": "a1"}, {"product_id": "a3"}]},
+    ]
+
+    async def scenario():
+        await db.products.insert_many(products)
+        await db.orders.insert_many(orders)
+        await db.orders_archive.insert_one(
+            {"id": "o0", "status": "delivered", "items": [{"product_id": "c1"}, {"product_id": "a2"}]}
+        )
+        await db.product_related.insert_one({"product_id": "deleted", "related": []})
+        await build_related(db, top_k=3)
+        return {doc["product_id"]: doc["related"] async for doc in db.product_related.find({})}
+
+    related = asyncio.run(scenario())
+
+    # Co-purchased first, then same category: featured before newest
+    assert related["a1"] == ["c1", "a2", "a3"]
+    assert related["c1"] == ["a1", "a2"]
+    assert related["a3"] == ["a2", "a1"]
+    assert "deleted" not in related
+
+
+def catalog_product(product_id, category="anillos", featured=False, day=1, in_stock=True, stock=3):
+    return {"id": product_id, "name": product_id, "price": 10.0, "category_slug": category, "featured": featured,
+            "in_stock": in_stock, "stock": stock, "created_at": f"2026-01-{day:02d}T00:00:00+00:00"}
+
+
+def test_related_route_keeps_rank_hides_unavailable_and_applies_limit(db):
+    async def scenario():
+        await db.products.insert_many([
+            catalog_product("a1"),
+            catalog_product("r1"), catalog_product("r2"), catalog_product("r3"),
+            catalog_product("hidden", in_stock=False), catalog_product("sold-out", stock=0),
+        ])
+        await db.product_related.insert_one(
+            {"product_id": "a1", "related": ["r3", "hidden", "r1", "sold-out", "r2"]}
+        )
+        await db.product_related.insert_one({"product_id": "r1", "related": []})
+        everything = await server.get_related_products("a1", limit=8)
+        limited = await server.get_related_products("a1", limit=2)
+        empty = await server.get_related_products("r1", limit=8)
+        return everything, limited, empty
+
+    everything, limited, empty = asyncio.run(scenario())
+
+    assert [p["id"] for p in everything] == ["r3", "r1", "r2"]
+    assert [p["id"] for p in limited] == ["r3", "r1"]
+    assert empty == []
+
+
+def test_related_route_falls_back_to_category_for_products_not_yet_computed(db):
+    async def scenario():
+        await db.products.insert_many([
+            catalog_product("new", day=9),
+            catalog_product("old", day=1), catalog_product("newest", day=5),
+            catalog_product("featured", featured=True, day=2),
+            catalog_product("hidden", featured=True, in_stock=False),
+            catalog_product("collar", category="collares", day=8),
+        ])
+        fallback = await server.get_related_products("new", limit=8)
+        limited = await server.get_related_products("new", limit=1)
+        missing = await server.get_related_products("nope", limit=8)
+        return fallback, limited, missing
+
+    fallback, limited, missing = asyncio.run(scenario())
+
+    assert [p["id"] for p in fallback] == ["featured", "newest", "old"]
+    assert [p["id"] for p in limited] == ["featured"]
+    assert missing == []